@@ -0,0 +1,18 @@
+"""
+Process-wide executor pools shared by the parser routers.
+
+Each router previously owned its own pool, so a burst of PDF uploads and
+receipt uploads together could oversubscribe the CPU (or, before that,
+block the event loop outright). Sizing one pool of each kind to the core
+count keeps total parallelism bounded no matter which endpoints are hot.
+"""
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+# CPU-bound work that releases the GIL in C extensions (PDF text
+# extraction, regex scanning over extracted text)
+CPU_EXECUTOR = ThreadPoolExecutor(max_workers=os.cpu_count())
+
+# OCR: Tesseract is run single-threaded (OMP_THREAD_LIMIT=1), one
+# process per core
+OCR_EXECUTOR = ProcessPoolExecutor(max_workers=os.cpu_count())
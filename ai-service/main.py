@@ -53,7 +53,21 @@ async def health():
     }
 
 if __name__ == "__main__":
+    import importlib.util
     import uvicorn
     port = int(os.getenv("PORT", 8001))
     host = os.getenv("HOST", "0.0.0.0")
-    uvicorn.run(app, host=host, port=port)
+    workers = int(os.getenv("WORKERS", 1))
+    # uvicorn[standard] ships uvloop and httptools; request them explicitly
+    # so the service never silently falls back to the pure-Python loop.
+    # uvloop does not exist on Windows (start.bat runs this file), so only
+    # ask for it where it is actually installed.
+    has_uvloop = importlib.util.find_spec("uvloop") is not None
+    uvicorn.run(
+        "main:app",
+        host=host,
+        port=port,
+        workers=workers,
+        loop="uvloop" if has_uvloop else "auto",
+        http="httptools" if has_uvloop else "auto",
+    )
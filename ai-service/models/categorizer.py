@@ -1,283 +1,514 @@
-"""
-Transaction categorization model using pattern matching.
-"""
-import re
-from typing import Dict, List, Tuple, Optional
-import json
-import os
-
-
-class TransactionCategorizer:
-    """
-    Simple pattern-based categorization model for transactions.
-    Uses keyword matching and learned rules to suggest categories.
-    """
-    
-    def __init__(self, rules_file: str = "categorization_rules.json"):
-        """
-        Initialize the categorizer with default patterns and load learned rules.
-        
-        Args:
-            rules_file: Path to JSON file storing learned categorization rules
-        """
-        self.rules_file = rules_file
-        
-        # Default keyword patterns for common categories
-        self.default_patterns: Dict[str, List[str]] = {
-            "Food & Dining": [
-                "grocery", "restaurant", "food", "cafe", "coffee", "lunch", "dinner",
-                "breakfast", "pizza", "burger", "starbucks", "mcdonald", "subway",
-                "chipotle", "domino", "taco", "sushi", "deli", "bakery", "market",
-                "whole foods", "trader joe", "safeway", "kroger", "publix"
-            ],
-            "Transportation": [
-                "gas", "fuel", "uber", "lyft", "taxi", "parking", "transit",
-                "metro", "bus", "train", "subway", "toll", "car wash", "auto",
-                "shell", "chevron", "exxon", "bp", "mobil"
-            ],
-            "Shopping": [
-                "amazon", "walmart", "target", "store", "shop", "mall", "retail",
-                "ebay", "etsy", "best buy", "costco", "ikea", "home depot", "lowes"
-            ],
-            "Utilities": [
-                "electric", "water", "gas", "internet", "phone", "utility",
-                "comcast", "verizon", "at&t", "spectrum", "xfinity", "power",
-                "energy", "cable", "wireless"
-            ],
-            "Entertainment": [
-                "movie", "netflix", "spotify", "hulu", "disney", "game", "concert",
-                "theater", "cinema", "music", "streaming", "youtube", "apple music",
-                "xbox", "playstation", "steam"
-            ],
-            "Healthcare": [
-                "doctor", "pharmacy", "hospital", "medical", "health", "clinic",
-                "cvs", "walgreens", "rite aid", "dental", "dentist", "vision",
-                "prescription", "medicine", "urgent care"
-            ],
-            "Housing": [
-                "rent", "mortgage", "insurance", "hoa", "property", "lease",
-                "apartment", "condo", "home insurance", "renters insurance"
-            ],
-            "Personal Care": [
-                "salon", "haircut", "spa", "gym", "fitness", "yoga", "massage",
-                "beauty", "cosmetic", "barber", "nail", "planet fitness", "la fitness"
-            ],
-            "Bills & Fees": [
-                "bill", "fee", "charge", "payment", "subscription", "membership",
-                "annual fee", "service charge", "late fee"
-            ],
-            "Income": [
-                "salary", "paycheck", "wage", "income", "deposit", "payment received",
-                "refund", "reimbursement", "bonus", "commission"
-            ]
-        }
-        
-        # Learned rules from user corrections
-        self.learned_rules: List[Dict] = []
-        self._load_learned_rules()
-    
-    def _load_learned_rules(self) -> None:
-        """Load learned categorization rules from file."""
-        if os.path.exists(self.rules_file):
-            try:
-                with open(self.rules_file, 'r') as f:
-                    self.learned_rules = json.load(f)
-            except (json.JSONDecodeError, IOError) as e:
-                print(f"Error loading learned rules: {e}")
-                self.learned_rules = []
-    
-    def _save_learned_rules(self) -> None:
-        """Save learned categorization rules to file."""
-        try:
-            with open(self.rules_file, 'w') as f:
-                json.dump(self.learned_rules, f, indent=2)
-        except IOError as e:
-            print(f"Error saving learned rules: {e}")
-    
-    def categorize(self, description: str, amount: Optional[float] = None) -> Tuple[str, float]:
-        """
-        Suggest a category for a transaction based on its description.
-        
-        Args:
-            description: Transaction description text
-            amount: Optional transaction amount (can be used for additional context)
-            
-        Returns:
-            Tuple of (category_name, confidence_score)
-        """
-        description_lower = description.lower()
-        
-        # First, check learned rules (higher priority)
-        learned_match = self._check_learned_rules(description_lower)
-        if learned_match:
-            return learned_match
-        
-        # Then check default patterns
-        default_match = self._check_default_patterns(description_lower)
-        if default_match:
-            return default_match
-        
-        # No match found - return uncategorized with low confidence
-        return ("Uncategorized", 0.3)
-    
-    def _check_learned_rules(self, description_lower: str) -> Optional[Tuple[str, float]]:
-        """
-        Check if description matches any learned rules.
-        
-        Args:
-            description_lower: Lowercase transaction description
-            
-        Returns:
-            Tuple of (category, confidence) if match found, None otherwise
-        """
-        best_match = None
-        best_confidence = 0.0
-        
-        for rule in self.learned_rules:
-            pattern = rule.get("pattern", "").lower()
-            category = rule.get("category")
-            learned_from = rule.get("learned_from", 1)
-            
-            if not pattern or not category:
-                continue
-            
-            # Check if pattern matches (exact substring match)
-            if pattern in description_lower:
-                # Confidence increases with number of times learned
-                # Base confidence of 0.8, increases up to 0.95
-                confidence = min(0.8 + (learned_from * 0.03), 0.95)
-                
-                if confidence > best_confidence:
-                    best_match = (category, confidence)
-                    best_confidence = confidence
-        
-        return best_match
-    
-    def _check_default_patterns(self, description_lower: str) -> Optional[Tuple[str, float]]:
-        """
-        Check if description matches any default keyword patterns.
-        
-        Args:
-            description_lower: Lowercase transaction description
-            
-        Returns:
-            Tuple of (category, confidence) if match found, None otherwise
-        """
-        matches = []
-        
-        for category, keywords in self.default_patterns.items():
-            for keyword in keywords:
-                if keyword in description_lower:
-                    # Calculate confidence based on keyword specificity
-                    # Longer keywords get higher confidence
-                    confidence = min(0.6 + (len(keyword) * 0.01), 0.75)
-                    matches.append((category, confidence, len(keyword)))
-        
-        if not matches:
-            return None
-        
-        # Return the match with highest confidence and longest keyword
-        matches.sort(key=lambda x: (x[1], x[2]), reverse=True)
-        return (matches[0][0], matches[0][1])
-    
-    def learn(self, description: str, category: str, amount: Optional[float] = None) -> bool:
-        """
-        Learn from user correction to improve future categorization.
-        
-        Args:
-            description: Transaction description
-            category: Correct category provided by user
-            amount: Optional transaction amount
-            
-        Returns:
-            True if learning was successful
-        """
-        description_lower = description.lower()
-        
-        # Extract the most distinctive part of the description as pattern
-        # For now, use the whole description, but could be enhanced to extract merchant name
-        pattern = self._extract_pattern(description_lower)
-        
-        # Check if we already have a rule for this pattern
-        existing_rule = None
-        for rule in self.learned_rules:
-            if rule.get("pattern") == pattern:
-                existing_rule = rule
-                break
-        
-        if existing_rule:
-            # Update existing rule
-            if existing_rule.get("category") == category:
-                # Same category - increase learned_from count
-                existing_rule["learned_from"] = existing_rule.get("learned_from", 1) + 1
-            else:
-                # Different category - replace with new category and reset count
-                existing_rule["category"] = category
-                existing_rule["learned_from"] = 1
-        else:
-            # Create new rule
-            new_rule = {
-                "pattern": pattern,
-                "category": category,
-                "learned_from": 1
-            }
-            self.learned_rules.append(new_rule)
-        
-        # Save updated rules
-        self._save_learned_rules()
-        return True
-    
-    def _extract_pattern(self, description_lower: str) -> str:
-        """
-        Extract a pattern from the transaction description.
-        Uses the first 2-3 significant words to create a more specific pattern.
-        
-        Args:
-            description_lower: Lowercase transaction description
-            
-        Returns:
-            Extracted pattern string
-        """
-        # Remove common prefixes and suffixes
-        cleaned = re.sub(r'\b(purchase|payment|at|from|to|the|a|an)\b', '', description_lower)
-        cleaned = cleaned.strip()
-        
-        # Extract first 2-3 meaningful words (at least 3 characters each)
-        words = []
-        for word in cleaned.split():
-            if len(word) >= 3 and (word.isalpha() or word.isalnum()):
-                words.append(word)
-                if len(words) >= 2:
-                    break
-        
-        if words:
-            return ' '.join(words)
-        
-        # If no good words found, use first 30 characters of original
-        return description_lower[:30].strip()
-    
-    def get_learned_rules_count(self) -> int:
-        """Get the number of learned rules."""
-        return len(self.learned_rules)
-    
-    def clear_learned_rules(self) -> None:
-        """Clear all learned rules (for testing purposes)."""
-        self.learned_rules = []
-        self._save_learned_rules()
-
-
-# Global categorizer instance
-_categorizer_instance: Optional[TransactionCategorizer] = None
-
-
-def get_categorizer() -> TransactionCategorizer:
-    """
-    Get or create the global categorizer instance.
-    
-    Returns:
-        TransactionCategorizer instance
-    """
-    global _categorizer_instance
-    if _categorizer_instance is None:
-        _categorizer_instance = TransactionCategorizer()
-    return _categorizer_instance
+"""
+Transaction categorization model using pattern matching.
+"""
+import atexit
+import functools
+import re
+from bisect import bisect_right
+from typing import Dict, List, Tuple, Optional
+import os
+
+import orjson
+
+try:
+    import ahocorasick
+except ImportError:
+    # Optional dependency - pure-Python fallbacks are used when missing
+    ahocorasick = None
+
+
+# ASCII-only A-Z -> a-z table; bank descriptions are overwhelmingly ASCII
+# and bytes.translate lowercases them in one C pass without the
+# Unicode-aware character classification str.lower performs
+_LOWER_TABLE = bytes.maketrans(
+    bytes(range(ord('A'), ord('Z') + 1)),
+    bytes(range(ord('a'), ord('z') + 1)),
+)
+
+
+def _fast_lower(text: str) -> str:
+    """Lowercase a description, taking the bytes fast path for ASCII input."""
+    if text.isascii():
+        return text.encode('ascii').translate(_LOWER_TABLE).decode('ascii')
+    return text.lower()
+
+
+# Trailing reference numbers ("BIEDRONKA 123" vs "BIEDRONKA 456") vary
+# per transaction while naming the same merchant
+_TRAILING_DIGITS_RX = re.compile(r'[\s\d]+$')
+
+
+def _norm(description: str) -> str:
+    """Normalize a description into a stable merchant cache key."""
+    lowered = ' '.join(_fast_lower(description).split())
+    return _TRAILING_DIGITS_RX.sub('', lowered) or lowered
+
+
+class TransactionCategorizer:
+    """
+    Simple pattern-based categorization model for transactions.
+    Uses keyword matching and learned rules to suggest categories.
+    """
+
+    # Common words stripped out when extracting a pattern from a description
+    _STOPWORDS = frozenset({"purchase", "payment", "at", "from", "to", "the", "a", "an"})
+
+    def __init__(self, rules_file: Optional[str] = "categorization_rules.json"):
+        """
+        Initialize the categorizer with default patterns and load learned rules.
+
+        Args:
+            rules_file: Path to JSON file storing learned categorization rules,
+                or None to keep learned rules in memory only
+        """
+        self.rules_file = rules_file
+        
+        # Default keyword patterns for common categories
+        self.default_patterns: Dict[str, List[str]] = {
+            "Food & Dining": [
+                "grocery", "restaurant", "food", "cafe", "coffee", "lunch", "dinner",
+                "breakfast", "pizza", "burger", "starbucks", "mcdonald", "subway",
+                "chipotle", "domino", "taco", "sushi", "deli", "bakery", "market",
+                "whole foods", "trader joe", "safeway", "kroger", "publix"
+            ],
+            "Transportation": [
+                "gas", "fuel", "uber", "lyft", "taxi", "parking", "transit",
+                "metro", "bus", "train", "subway", "toll", "car wash", "auto",
+                "shell", "chevron", "exxon", "bp", "mobil"
+            ],
+            "Shopping": [
+                "amazon", "walmart", "target", "store", "shop", "mall", "retail",
+                "ebay", "etsy", "best buy", "costco", "ikea", "home depot", "lowes"
+            ],
+            "Utilities": [
+                "electric", "water", "gas", "internet", "phone", "utility",
+                "comcast", "verizon", "at&t", "spectrum", "xfinity", "power",
+                "energy", "cable", "wireless"
+            ],
+            "Entertainment": [
+                "movie", "netflix", "spotify", "hulu", "disney", "game", "concert",
+                "theater", "cinema", "music", "streaming", "youtube", "apple music",
+                "xbox", "playstation", "steam"
+            ],
+            "Healthcare": [
+                "doctor", "pharmacy", "hospital", "medical", "health", "clinic",
+                "cvs", "walgreens", "rite aid", "dental", "dentist", "vision",
+                "prescription", "medicine", "urgent care"
+            ],
+            "Housing": [
+                "rent", "mortgage", "insurance", "hoa", "property", "lease",
+                "apartment", "condo", "home insurance", "renters insurance"
+            ],
+            "Personal Care": [
+                "salon", "haircut", "spa", "gym", "fitness", "yoga", "massage",
+                "beauty", "cosmetic", "barber", "nail", "planet fitness", "la fitness"
+            ],
+            "Bills & Fees": [
+                "bill", "fee", "charge", "payment", "subscription", "membership",
+                "annual fee", "service charge", "late fee"
+            ],
+            "Income": [
+                "salary", "paycheck", "wage", "income", "deposit", "payment received",
+                "refund", "reimbursement", "bonus", "commission"
+            ]
+        }
+        
+        # Some keywords appear under several categories ("gas", "subway");
+        # collapse to keyword -> categories so each keyword is indexed and
+        # matched once, with candidate categories in declaration order
+        self._kw_to_cats: Dict[str, List[str]] = {}
+        for category, keywords in self.default_patterns.items():
+            for keyword in keywords:
+                self._kw_to_cats.setdefault(keyword, []).append(category)
+
+        # Precompile the unique keywords into a single Aho-Corasick
+        # automaton so each description is scanned once instead of
+        # substring-testing every keyword individually
+        if ahocorasick is not None:
+            self._ac = ahocorasick.Automaton()
+            for keyword, categories in self._kw_to_cats.items():
+                self._ac.add_word(keyword, (categories, len(keyword)))
+            self._ac.make_automaton()
+        else:
+            self._ac = None
+
+        # Fallback table: unique keywords sorted longest-first, so a
+        # brute-force scan can stop at the first hit (confidence grows with
+        # keyword length, so the first match is already the best one)
+        self._kw_sorted: List[Tuple[List[str], str, int]] = sorted(
+            (
+                (categories, keyword, len(keyword))
+                for keyword, categories in self._kw_to_cats.items()
+            ),
+            key=lambda entry: -entry[2]
+        )
+
+        # Learned rules from user corrections
+        self.learned_rules: List[Dict] = []
+        # Automaton over learned patterns, rebuilt lazily after mutations,
+        # plus a pattern -> rule index for O(1) updates in learn()
+        self._learned_ac: Optional[ahocorasick.Automaton] = None
+        self._learned_dirty = True
+        self._learned_by_pattern: Dict[str, int] = {}
+        self._learned_flat: List[Tuple[str, str, float]] = []
+        self._load_learned_rules()
+
+        # Debounce persistence: rewriting the whole rules file on every
+        # learn() call is O(rules x corrections) disk traffic, so writes
+        # are batched and flushed every _dirty_threshold changes or at exit
+        self._dirty_count = 0
+        self._dirty_threshold = 10
+        atexit.register(self.flush)
+
+        # Per-instance memo for categorize(); statement descriptions repeat
+        # heavily, so recurring merchants become a single dict lookup.
+        # Amount is ignored by the matching logic, so it is deliberately
+        # not part of the cache key. Invalidated whenever rules change.
+        self._categorize_cached = functools.lru_cache(maxsize=4096)(self._categorize_impl)
+    
+    def _load_learned_rules(self) -> None:
+        """Load learned categorization rules from file."""
+        if self.rules_file is None:
+            return
+        if os.path.exists(self.rules_file):
+            try:
+                with open(self.rules_file, 'rb') as f:
+                    self.learned_rules = orjson.loads(f.read())
+            except (orjson.JSONDecodeError, IOError) as e:
+                print(f"Error loading learned rules: {e}")
+                self.learned_rules = []
+    
+    def _save_learned_rules(self) -> None:
+        """Save learned categorization rules to file atomically."""
+        if self.rules_file is None:
+            # In-memory categorizer: nothing to persist
+            self._dirty_count = 0
+            return
+        tmp_file = self.rules_file + ".tmp"
+        try:
+            with open(tmp_file, 'wb') as f:
+                f.write(orjson.dumps(self.learned_rules, option=orjson.OPT_INDENT_2))
+            # Atomic rename so a crash mid-write never corrupts the rules file
+            os.replace(tmp_file, self.rules_file)
+        except IOError as e:
+            print(f"Error saving learned rules: {e}")
+        self._dirty_count = 0
+
+    def flush(self) -> None:
+        """Write any unsaved rule changes to disk immediately."""
+        if self._dirty_count > 0:
+            self._save_learned_rules()
+    
+    def categorize(self, description: str, amount: Optional[float] = None) -> Tuple[str, float]:
+        """
+        Suggest a category for a transaction based on its description.
+        
+        Args:
+            description: Transaction description text
+            amount: Optional transaction amount (can be used for additional context)
+            
+        Returns:
+            Tuple of (category_name, confidence_score)
+        """
+        # Normalizing (rather than just lowercasing) the cache key folds
+        # "BIEDRONKA 123" and "BIEDRONKA 456" into one cache entry
+        return self._categorize_cached(_norm(description))
+
+    def _categorize_impl(self, description_lower: str) -> Tuple[str, float]:
+        """Uncached categorization over learned rules and default patterns."""
+        # First, check learned rules (higher priority)
+        learned_match = self._check_learned_rules(description_lower)
+        if learned_match:
+            return learned_match
+        
+        # Then check default patterns
+        default_match = self._check_default_patterns(description_lower)
+        if default_match:
+            return default_match
+        
+        # No match found - return uncategorized with low confidence
+        return ("Uncategorized", 0.3)
+    
+    def categorize_batch(self, descriptions: List[str]) -> List[Tuple[str, float]]:
+        """
+        Suggest categories for a batch of transaction descriptions.
+
+        Joins the lowercased descriptions with a sentinel character and runs
+        each automaton over the combined text once, demultiplexing matches
+        back to their source description by offset. The sentinel cannot occur
+        inside any keyword, so matches never span two descriptions.
+
+        Args:
+            descriptions: Transaction description texts
+
+        Returns:
+            List of (category_name, confidence_score) tuples, one per input
+        """
+        if not descriptions:
+            return []
+
+        if self._ac is None:
+            # No automaton available - match each description on its own
+            return [self.categorize(description) for description in descriptions]
+
+        if self._learned_dirty:
+            self._rebuild_learned_index()
+
+        # Use the same normalization as the single-call cache key so batch
+        # and individual categorize() calls always agree
+        lowered = [_norm(description) for description in descriptions]
+        joined = "\x01".join(lowered)
+
+        # offsets[i] = start of description i within the joined text
+        offsets = []
+        position = 0
+        for text in lowered:
+            offsets.append(position)
+            position += len(text) + 1
+
+        count = len(lowered)
+        learned_best: List[Optional[Tuple[str, float]]] = [None] * count
+        learned_conf = [0.0] * count
+        if self._learned_ac is not None:
+            for end, rule_idx in self._learned_ac.iter(joined):
+                i = bisect_right(offsets, end) - 1
+                rule = self.learned_rules[rule_idx]
+                category = rule.get("category")
+                if not category:
+                    continue
+                confidence = min(0.8 + (rule.get("learned_from", 1) * 0.03), 0.95)
+                if confidence > learned_conf[i]:
+                    learned_conf[i] = confidence
+                    learned_best[i] = (category, confidence)
+
+        default_best: List[Optional[Tuple[str, float]]] = [None] * count
+        default_rank = [(0.0, 0)] * count
+        for end, (categories, keyword_len) in self._ac.iter(joined):
+            i = bisect_right(offsets, end) - 1
+            confidence = min(0.6 + (keyword_len * 0.01), 0.75)
+            rank = (confidence, keyword_len)
+            if rank > default_rank[i]:
+                default_rank[i] = rank
+                default_best[i] = (categories[0], confidence)
+
+        return [
+            learned_best[i] or default_best[i] or ("Uncategorized", 0.3)
+            for i in range(count)
+        ]
+
+    def _check_learned_rules(self, description_lower: str) -> Optional[Tuple[str, float]]:
+        """
+        Check if description matches any learned rules.
+        
+        Args:
+            description_lower: Lowercase transaction description
+            
+        Returns:
+            Tuple of (category, confidence) if match found, None otherwise
+        """
+        if self._learned_dirty:
+            self._rebuild_learned_index()
+
+        if self._learned_ac is not None:
+            best_match = None
+            best_confidence = 0.0
+            for _end, rule_idx in self._learned_ac.iter(description_lower):
+                rule = self.learned_rules[rule_idx]
+                category = rule.get("category")
+                if not category:
+                    continue
+                # Confidence increases with number of times learned
+                # Base confidence of 0.8, increases up to 0.95
+                confidence = min(0.8 + (rule.get("learned_from", 1) * 0.03), 0.95)
+                if confidence > best_confidence:
+                    best_match = (category, confidence)
+                    best_confidence = confidence
+            return best_match
+
+        # Fallback: walk the confidence-sorted flat table and return on
+        # the first substring hit — by construction the best match. A
+        # fused-alternation finditer is non-overlapping, so a weaker
+        # pattern matching earlier in the string would consume text and
+        # hide a stronger overlapping one.
+        for pattern, category, confidence in self._learned_flat:
+            if pattern in description_lower:
+                return (category, confidence)
+        return None
+
+    def _rebuild_learned_index(self) -> None:
+        """Rebuild the learned-rule automaton and pattern index after mutations."""
+        self._learned_by_pattern = {}
+        automaton = ahocorasick.Automaton() if ahocorasick is not None else None
+        flat: List[Tuple[str, str, float]] = []
+        for idx, rule in enumerate(self.learned_rules):
+            # Normalize here too so rules persisted before normalization
+            # (trailing digits, doubled whitespace) still match _norm keys
+            pattern = _norm(rule.get("pattern", ""))
+            category = rule.get("category")
+            if not pattern:
+                continue
+            self._learned_by_pattern[pattern] = idx
+            if category:
+                confidence = min(0.8 + (rule.get("learned_from", 1) * 0.03), 0.95)
+                flat.append((pattern, category, confidence))
+            if automaton is not None:
+                automaton.add_word(pattern, idx)
+
+        # Flat (pattern, category, confidence) rows sorted best-first, so
+        # the dependency-free path does no dict lookups or math per call
+        flat.sort(key=lambda row: -row[2])
+        self._learned_flat = flat
+
+        if automaton is not None and len(automaton) > 0:
+            automaton.make_automaton()
+            self._learned_ac = automaton
+        else:
+            self._learned_ac = None
+
+        self._learned_dirty = False
+    
+    def _check_default_patterns(self, description_lower: str) -> Optional[Tuple[str, float]]:
+        """
+        Check if description matches any default keyword patterns.
+        
+        Args:
+            description_lower: Lowercase transaction description
+            
+        Returns:
+            Tuple of (category, confidence) if match found, None otherwise
+        """
+        if self._ac is not None:
+            # Track the best match as we scan instead of collecting and
+            # sorting; confidence grows with keyword length, capped at 0.75
+            best_match = None
+            best_rank = (0.0, 0)
+            for _end, (categories, keyword_len) in self._ac.iter(description_lower):
+                confidence = min(0.6 + (keyword_len * 0.01), 0.75)
+                rank = (confidence, keyword_len)
+                if rank > best_rank:
+                    best_rank = rank
+                    best_match = (categories[0], confidence)
+            return best_match
+
+        # Fallback scan: keywords are pre-sorted longest-first, so the first
+        # hit is already the highest-confidence match. The first-character
+        # set check cheaply rejects most keywords before the substring test.
+        present = set(description_lower)
+        for categories, keyword, keyword_len in self._kw_sorted:
+            if keyword[0] in present and keyword in description_lower:
+                return (categories[0], min(0.6 + (keyword_len * 0.01), 0.75))
+
+        return None
+    
+    def learn(self, description: str, category: str, amount: Optional[float] = None) -> bool:
+        """
+        Learn from user correction to improve future categorization.
+        
+        Args:
+            description: Transaction description
+            category: Correct category provided by user
+            amount: Optional transaction amount
+            
+        Returns:
+            True if learning was successful
+        """
+        # Normalize the same way categorize() builds its cache key, so a
+        # pattern learned from "PAYPAL 123" matches the key "paypal"
+        description_lower = _norm(description)
+
+        # Extract the most distinctive part of the description as pattern
+        # For now, use the whole description, but could be enhanced to extract merchant name
+        pattern = self._extract_pattern(description_lower)
+        
+        # Check if we already have a rule for this pattern
+        if self._learned_dirty:
+            self._rebuild_learned_index()
+
+        existing_idx = self._learned_by_pattern.get(pattern)
+        existing_rule = self.learned_rules[existing_idx] if existing_idx is not None else None
+
+        if existing_rule:
+            # Update existing rule
+            if existing_rule.get("category") == category:
+                # Same category - increase learned_from count
+                existing_rule["learned_from"] = existing_rule.get("learned_from", 1) + 1
+            else:
+                # Different category - replace with new category and reset count
+                existing_rule["category"] = category
+                existing_rule["learned_from"] = 1
+        else:
+            # Create new rule
+            new_rule = {
+                "pattern": pattern,
+                "category": category,
+                "learned_from": 1
+            }
+            self.learned_rules.append(new_rule)
+
+        self._learned_dirty = True
+        self._categorize_cached.cache_clear()
+
+        # Save updated rules once enough changes have accumulated;
+        # flush() / atexit covers whatever is still pending
+        self._dirty_count += 1
+        if self._dirty_count >= self._dirty_threshold:
+            self._save_learned_rules()
+        return True
+    
+    def _extract_pattern(self, description_lower: str) -> str:
+        """
+        Extract a pattern from the transaction description.
+        Uses the first 2-3 significant words to create a more specific pattern.
+        
+        Args:
+            description_lower: Lowercase transaction description
+            
+        Returns:
+            Extracted pattern string
+        """
+        # Extract first 2-3 meaningful words (at least 3 characters each),
+        # skipping common filler words; str.split already gives us word
+        # boundaries so no regex is needed here
+        words = []
+        for word in description_lower.split():
+            if word in self._STOPWORDS:
+                continue
+            if len(word) >= 3 and word.isalnum():
+                words.append(word)
+                if len(words) >= 2:
+                    break
+
+        if words:
+            return ' '.join(words)
+        
+        # If no good words found, use first 30 characters of original
+        return description_lower[:30].strip()
+    
+    def get_learned_rules_count(self) -> int:
+        """Get the number of learned rules."""
+        return len(self.learned_rules)
+    
+    def clear_learned_rules(self) -> None:
+        """Clear all learned rules (for testing purposes)."""
+        self.learned_rules = []
+        self._learned_dirty = True
+        self._categorize_cached.cache_clear()
+        # Clearing should take effect on disk immediately
+        self._save_learned_rules()
+
+
+# Global categorizer instance
+_categorizer_instance: Optional[TransactionCategorizer] = None
+
+
+def get_categorizer() -> TransactionCategorizer:
+    """
+    Get or create the global categorizer instance.
+    
+    Returns:
+        TransactionCategorizer instance
+    """
+    global _categorizer_instance
+    if _categorizer_instance is None:
+        _categorizer_instance = TransactionCategorizer()
+    return _categorizer_instance
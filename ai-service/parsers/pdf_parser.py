@@ -1,345 +1,555 @@
-"""
-PDF bank statement parser using PyPDF2 and pdfplumber.
-"""
-import re
-from datetime import datetime
-from typing import List, Dict, Optional
-import PyPDF2
-import pdfplumber
-
-
-class PDFParser:
-    """Parser for bank statement PDFs."""
-    
-    # Common transaction patterns (supports both English and Polish formats)
-    TRANSACTION_PATTERNS = [
-        # Polish date format: DD.MM.YYYY with amount (comma or period decimal)
-        r'(\d{1,2}\.\d{1,2}\.\d{2,4})\s+(.+?)\s+([+-]?\s*[\d\s]+[,.]?\d{0,2})\s*(?:PLN|zł)?',
-        # Date Amount Description pattern (MM/DD/YYYY or DD/MM/YYYY)
-        r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+([+-]?\$?\s*[\d,]+\.?\d*)\s+(.+?)(?=\d{1,2}[/-]|\n|$)',
-        # Date Description Amount pattern
-        r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+(.+?)\s+([+-]?\$?\s*[\d,]+\.?\d{2})',
-        # YYYY-MM-DD format
-        r'(\d{4}-\d{2}-\d{2})\s+(.+?)\s+([+-]?\$?\s*[\d,]+\.?\d{2})',
-        # Polish format with spaces in amounts: DD.MM.YYYY Description Amount
-        r'(\d{1,2}\.\d{1,2}\.\d{4})\s+(.+?)\s+([+-]?\s*[\d\s]+,\d{2})',
-    ]
-    
-    def __init__(self):
-        """Initialize PDF parser."""
-        pass
-    
-    def parse_pdf(self, file_path: str) -> List[Dict]:
-        """
-        Parse PDF file and extract transactions.
-        
-        Args:
-            file_path: Path to PDF file
-            
-        Returns:
-            List of transaction dictionaries
-        """
-        transactions = []
-        
-        # Try pdfplumber first (better for tables)
-        try:
-            transactions = self._parse_with_pdfplumber(file_path)
-            if transactions:
-                return transactions
-        except Exception as e:
-            print(f"pdfplumber parsing failed: {e}")
-        
-        # Fallback to PyPDF2
-        try:
-            transactions = self._parse_with_pypdf2(file_path)
-        except Exception as e:
-            print(f"PyPDF2 parsing failed: {e}")
-        
-        return transactions
-    
-    def _parse_with_pdfplumber(self, file_path: str) -> List[Dict]:
-        """Parse PDF using pdfplumber (better for structured tables)."""
-        transactions = []
-        
-        with pdfplumber.open(file_path) as pdf:
-            for page in pdf.pages:
-                text = page.extract_text()
-                if text:
-                    page_transactions = self._extract_transactions_from_text(text)
-                    transactions.extend(page_transactions)
-        
-        return transactions
-    
-    def _parse_with_pypdf2(self, file_path: str) -> List[Dict]:
-        """Parse PDF using PyPDF2 (fallback method)."""
-        transactions = []
-        
-        with open(file_path, 'rb') as file:
-            pdf_reader = PyPDF2.PdfReader(file)
-            
-            for page in pdf_reader.pages:
-                text = page.extract_text()
-                if text:
-                    page_transactions = self._extract_transactions_from_text(text)
-                    transactions.extend(page_transactions)
-        
-        return transactions
-    
-    def _extract_transactions_from_text(self, text: str) -> List[Dict]:
-        """
-        Extract transaction data from text using pattern matching.
-        
-        Args:
-            text: Extracted text from PDF
-            
-        Returns:
-            List of transaction dictionaries
-        """
-        transactions = []
-        
-        # Try each pattern
-        for pattern in self.TRANSACTION_PATTERNS:
-            matches = re.finditer(pattern, text, re.MULTILINE)
-            
-            for match in matches:
-                try:
-                    transaction = self._parse_transaction_match(match)
-                    if transaction:
-                        transactions.append(transaction)
-                except Exception as e:
-                    print(f"Error parsing transaction: {e}")
-                    continue
-        
-        # Remove duplicates based on date, amount, and description
-        transactions = self._deduplicate_transactions(transactions)
-        
-        return transactions
-    
-    def _parse_transaction_match(self, match: re.Match) -> Optional[Dict]:
-        """
-        Parse a regex match into a transaction dictionary.
-        
-        Args:
-            match: Regex match object
-            
-        Returns:
-            Transaction dictionary or None
-        """
-        groups = match.groups()
-        
-        if len(groups) < 3:
-            return None
-        
-        # Determine which group is date, amount, description
-        date_str = groups[0]
-        
-        # Check if second group is amount or description
-        if self._is_amount(groups[1]):
-            amount_str = groups[1]
-            description = groups[2].strip()
-        else:
-            description = groups[1].strip()
-            amount_str = groups[2]
-        
-        # Parse date
-        parsed_date = self._parse_date(date_str)
-        if not parsed_date:
-            return None
-        
-        # Parse amount
-        amount = self._parse_amount(amount_str)
-        if amount is None:
-            return None
-        
-        # Determine transaction type
-        transaction_type = "expense" if amount < 0 else "income"
-        amount = abs(amount)
-        
-        # Clean description
-        description = self._clean_description(description)
-        
-        return {
-            "date": parsed_date,
-            "amount": amount,
-            "description": description,
-            "type": transaction_type
-        }
-    
-    def _is_amount(self, text: str) -> bool:
-        """Check if text looks like an amount."""
-        # Remove common currency symbols and whitespace
-        cleaned = text.replace('$', '').replace(',', '').strip()
-        try:
-            float(cleaned)
-            return True
-        except ValueError:
-            return False
-    
-    def _parse_date(self, date_str: str) -> Optional[str]:
-        """
-        Parse date string into YYYY-MM-DD format.
-        Supports both English and Polish date formats.
-        
-        Args:
-            date_str: Date string in various formats
-            
-        Returns:
-            Date in YYYY-MM-DD format or None
-        """
-        date_formats = [
-            # Polish format (most common)
-            '%d.%m.%Y', '%d.%m.%y',
-            # English formats
-            '%m/%d/%Y', '%m-%d-%Y',
-            '%d/%m/%Y', '%d-%m-%Y',
-            '%m/%d/%y', '%m-%d-%y',
-            '%d/%m/%y', '%d-%m-%y',
-            '%Y-%m-%d', '%Y/%m/%d',
-        ]
-        
-        for fmt in date_formats:
-            try:
-                dt = datetime.strptime(date_str.strip(), fmt)
-                return dt.strftime('%Y-%m-%d')
-            except ValueError:
-                continue
-        
-        return None
-    
-    def _parse_amount(self, amount_str: str) -> Optional[float]:
-        """
-        Parse amount string into float.
-        Supports both English (period) and Polish (comma) decimal separators.
-        
-        Args:
-            amount_str: Amount string with possible currency symbols
-            
-        Returns:
-            Float amount or None
-        """
-        try:
-            # Remove currency symbols (both $ and PLN/zł)
-            cleaned = amount_str.replace('$', '').replace('PLN', '').replace('zł', '').strip()
-            
-            # Remove spaces (Polish format often has spaces in large numbers)
-            cleaned = cleaned.replace(' ', '')
-            
-            # Determine if using comma or period as decimal separator
-            # Polish uses comma (,) as decimal separator and space/period as thousands separator
-            # English uses period (.) as decimal separator and comma as thousands separator
-            
-            has_comma = ',' in cleaned
-            has_period = '.' in cleaned
-            
-            if has_comma and has_period:
-                # Both present - determine which is decimal separator
-                comma_pos = cleaned.rfind(',')
-                period_pos = cleaned.rfind('.')
-                
-                if comma_pos > period_pos:
-                    # Comma is decimal separator (Polish format: 1.234,56)
-                    cleaned = cleaned.replace('.', '').replace(',', '.')
-                else:
-                    # Period is decimal separator (English format: 1,234.56)
-                    cleaned = cleaned.replace(',', '')
-            elif has_comma:
-                # Only comma present
-                # Check if it's followed by exactly 2 digits (decimal separator)
-                # or more than 2 digits (thousands separator)
-                comma_pos = cleaned.rfind(',')
-                after_comma = cleaned[comma_pos + 1:]
-                
-                if len(after_comma) == 2 and after_comma.isdigit():
-                    # Polish decimal separator: 149,06
-                    cleaned = cleaned.replace(',', '.')
-                elif len(after_comma) > 2:
-                    # Thousands separator: 1,234 (remove it)
-                    cleaned = cleaned.replace(',', '')
-                else:
-                    # Assume decimal separator
-                    cleaned = cleaned.replace(',', '.')
-            elif has_period:
-                # Only period present
-                # Check if it's followed by exactly 2 digits (decimal separator)
-                period_pos = cleaned.rfind('.')
-                after_period = cleaned[period_pos + 1:]
-                
-                if len(after_period) == 2 and after_period.isdigit():
-                    # Decimal separator: 149.06
-                    pass  # Keep as is
-                elif len(after_period) > 2:
-                    # Thousands separator: 1.234 (remove it)
-                    cleaned = cleaned.replace('.', '')
-                # else keep as is
-            
-            # Handle negative amounts (withdrawals/expenses)
-            is_negative = False
-            if cleaned.startswith('-') or cleaned.startswith('('):
-                is_negative = True
-                cleaned = cleaned.replace('(', '').replace(')', '').replace('-', '').strip()
-            elif cleaned.startswith('+'):
-                cleaned = cleaned[1:].strip()
-            
-            amount = float(cleaned)
-            
-            if is_negative:
-                amount = -amount
-            
-            return amount
-        except ValueError:
-            return None
-    
-    def _clean_description(self, description: str) -> str:
-        """
-        Clean and normalize transaction description.
-        
-        Args:
-            description: Raw description text
-            
-        Returns:
-            Cleaned description
-        """
-        # Remove extra whitespace
-        description = ' '.join(description.split())
-        
-        # Remove common noise
-        noise_patterns = [
-            r'\s+\d+$',  # Trailing numbers
-            r'^\d+\s+',  # Leading numbers
-        ]
-        
-        for pattern in noise_patterns:
-            description = re.sub(pattern, '', description)
-        
-        # Limit length
-        if len(description) > 200:
-            description = description[:200]
-        
-        return description.strip()
-    
-    def _deduplicate_transactions(self, transactions: List[Dict]) -> List[Dict]:
-        """
-        Remove duplicate transactions.
-        
-        Args:
-            transactions: List of transaction dictionaries
-            
-        Returns:
-            Deduplicated list
-        """
-        seen = set()
-        unique_transactions = []
-        
-        for trans in transactions:
-            # Create a key from date, amount, and first 50 chars of description
-            key = (
-                trans.get('date'),
-                trans.get('amount'),
-                trans.get('description', '')[:50]
-            )
-            
-            if key not in seen:
-                seen.add(key)
-                unique_transactions.append(trans)
-        
-        return unique_transactions
+"""
+PDF bank statement parser using PyPDF2 and pdfplumber.
+"""
+import functools
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from datetime import date
+from typing import List, Dict, Optional
+
+# PyPDF2 and pdfplumber are imported lazily inside the methods that use
+# them; pdfplumber alone drags in pdfminer.six and costs hundreds of
+# milliseconds of cold start that probe-only callers never need
+
+try:
+    import pymupdf
+except ImportError:
+    # Optional C-backed extractor; pure-Python backends are used when missing
+    pymupdf = None
+
+try:
+    from ciso8601 import parse_datetime
+except ImportError:
+    # Optional C parser for the ISO date hot path
+    parse_datetime = None
+
+
+logger = logging.getLogger(__name__)
+
+
+# Process pool for page-parallel extraction; pages are independent, so
+# larger statements fan out across cores. Only used past this page count
+# to keep fork overhead off small PDFs.
+_page_pool = ProcessPoolExecutor(max_workers=os.cpu_count())
+_PARALLEL_PAGE_THRESHOLD = 4
+
+
+def _extract_page_text(file_path: str, page_index: int) -> str:
+    """Extract one page's text (module-level so it is picklable)."""
+    doc = pymupdf.open(file_path)
+    try:
+        return doc[page_index].get_text("text")
+    finally:
+        doc.close()
+
+
+def _parse_page_transactions(file_path: str, page_index: int) -> List[Dict]:
+    """
+    Extract and regex-scan one page entirely inside the worker.
+
+    Shipping the parsed transactions back instead of raw page text keeps
+    the CPU-bound regex pass on the worker cores and shrinks the pickled
+    result to a handful of rows per page.
+    """
+    text = _extract_page_text(file_path, page_index)
+    if not text:
+        return []
+    return PDFParser()._extract_transactions_from_text(text)
+
+
+# Delete-table for counting digits per line; any transaction line needs
+# at least four (the shortest date shape) before the regex is worth running
+_DIGIT_TT = str.maketrans('', '', '0123456789')
+
+# Description cleanup: strip leading and trailing number noise in one
+# alternation pass (whitespace collapse is handled by str.split/join,
+# which beats an equivalent re.sub)
+_CLEAN_RX = re.compile(r'^\d+\s+|\s+\d+$')
+
+
+# Shape of an amount token: optional sign, optional currency, digits with
+# separators, optional Polish currency suffix
+_AMOUNT_RX = re.compile(r'[+-]?\s*\$?\s*\d[\d\s,.]*(?:PLN|zł)?')
+
+# Full amount grammar: sign, integer part (plain digits or groups of three
+# split by space/period/comma), optional decimal separator with a 1-2 digit
+# fraction, optional closing parenthesis
+_AMT_RX = re.compile(
+    r'^\s*(?P<sign>[-+(])?\s*'
+    r'(?P<int>\d{1,3}(?:[\s.,]\d{3})*|\d+)'
+    r'(?:(?P<dec>[.,])(?P<frac>\d{1,2}))?\s*\)?\s*$'
+)
+_NON_DIGIT_RX = re.compile(r'\D')
+
+
+# All supported date shapes in one regex: ISO (groups 1-3) or
+# day/month-ambiguous with 2- or 4-digit year (groups 4-6)
+_DATE_RX = re.compile(
+    r'^\s*(?:(\d{4})[-/](\d{1,2})[-/](\d{1,2})'
+    r'|(\d{1,2})[./-](\d{1,2})[./-](\d{2,4}))\s*$'
+)
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_date_impl(date_str: str) -> Optional[str]:
+    """Parse a date string into YYYY-MM-DD (memoized; statements repeat dates)."""
+    # ISO dates are the most regular shape; ciso8601 parses them in C
+    if parse_datetime is not None:
+        stripped = date_str.strip()
+        if len(stripped) >= 10 and stripped[4:5] == '-':
+            try:
+                return parse_datetime(stripped).date().isoformat()
+            except ValueError:
+                pass
+
+    # Fast path: one regex match plus integer parsing instead of up to
+    # a dozen strptime attempts, each of which raises on a miss
+    m = _DATE_RX.match(date_str)
+    if not m:
+        return None
+
+    if m.group(1):
+        # ISO: YYYY-MM-DD or YYYY/MM/DD
+        year, month, day = int(m.group(1)), int(m.group(2)), int(m.group(3))
+    else:
+        first, second, year = int(m.group(4)), int(m.group(5)), int(m.group(6))
+        if year < 100:
+            year = 2000 + year if year < 70 else 1900 + year
+        # Day-first for Polish dotted dates or when the first number
+        # cannot be a month; otherwise month-first, mirroring the
+        # old format-list order
+        if first > 12 or '.' in date_str:
+            day, month = first, second
+        else:
+            month, day = first, second
+
+    try:
+        date(year, month, day)
+    except ValueError:
+        return None
+
+    return f'{year:04d}-{month:02d}-{day:02d}'
+
+
+@functools.lru_cache(maxsize=4096)
+def _parse_amount_impl(amount_str: str) -> Optional[float]:
+    """Parse an amount string into a float (memoized; amounts repeat too)."""
+    # Strip currency markers, then let one regex classify the whole token:
+    # sign, integer part with optional thousands grouping, optional
+    # 1-2 digit fraction after either decimal separator
+    cleaned = amount_str.replace('$', '').replace('PLN', '').replace('zł', '')
+
+    m = _AMT_RX.match(cleaned)
+    if not m:
+        return None
+
+    digits = _NON_DIGIT_RX.sub('', m.group('int'))
+    frac = m.group('frac')
+    amount = float(digits + '.' + frac) if frac else float(digits)
+
+    if m.group('sign') in ('-', '('):
+        amount = -amount
+
+    return amount
+
+
+class PDFParser:
+    """Parser for bank statement PDFs."""
+    
+    # Common transaction patterns (supports both English and Polish formats)
+    TRANSACTION_PATTERNS = [
+        # Polish date format: DD.MM.YYYY with amount (comma or period decimal)
+        r'(\d{1,2}\.\d{1,2}\.\d{2,4})\s+(.+?)\s+([+-]?\s*[\d\s]+[,.]?\d{0,2})\s*(?:PLN|zł)?',
+        # Date Amount Description pattern (MM/DD/YYYY or DD/MM/YYYY)
+        r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+([+-]?\$?\s*[\d,]+\.?\d*)\s+(.+?)(?=\d{1,2}[/-]|\n|$)',
+        # Date Description Amount pattern
+        r'(\d{1,2}[/-]\d{1,2}[/-]\d{2,4})\s+(.+?)\s+([+-]?\$?\s*[\d,]+\.?\d{2})',
+        # YYYY-MM-DD format
+        r'(\d{4}-\d{2}-\d{2})\s+(.+?)\s+([+-]?\$?\s*[\d,]+\.?\d{2})',
+        # Polish format with spaces in amounts: DD.MM.YYYY Description Amount
+        r'(\d{1,2}\.\d{1,2}\.\d{4})\s+(.+?)\s+([+-]?\s*[\d\s]+,\d{2})',
+    ]
+
+    # Compiled once at class creation; passing raw strings to re.finditer
+    # leans on the re module's small internal cache, which can thrash and
+    # recompile under load. Every pattern scans the text independently:
+    # fusing them into one first-branch-wins alternation loses rows on
+    # lines where a looser pattern mis-splits the amount (store numbers
+    # inside Polish merchant names satisfy the lazy description group, so
+    # only a stricter later pattern finds the real line-final amount).
+    _COMPILED_PATTERNS = tuple(re.compile(p, re.MULTILINE) for p in TRANSACTION_PATTERNS)
+
+    def __init__(self):
+        """Initialize PDF parser."""
+        pass
+
+    @classmethod
+    def clear_caches(cls) -> None:
+        """Flush the memoized date/amount parsers (for long-running services)."""
+        _parse_date_impl.cache_clear()
+        _parse_amount_impl.cache_clear()
+    
+    def parse_pdf(self, file_path: str) -> List[Dict]:
+        """
+        Parse PDF file and extract transactions.
+        
+        Args:
+            file_path: Path to PDF file
+            
+        Returns:
+            List of transaction dictionaries
+        """
+        transactions = []
+
+        # Try PyMuPDF first (C-backed, roughly an order of magnitude
+        # faster than the pure-Python extractors)
+        if pymupdf is not None:
+            try:
+                transactions = self._parse_with_pymupdf(file_path)
+                if transactions:
+                    return transactions
+            except Exception as e:
+                logger.warning("PyMuPDF parsing failed: %s", e)
+
+        # Then pdfplumber (better for tables)
+        try:
+            transactions = self._parse_with_pdfplumber(file_path)
+            if transactions:
+                return transactions
+        except Exception as e:
+            logger.warning("pdfplumber parsing failed: %s", e)
+
+        # Fallback to PyPDF2
+        try:
+            transactions = self._parse_with_pypdf2(file_path)
+        except Exception as e:
+            logger.warning("PyPDF2 parsing failed: %s", e)
+
+        return transactions
+
+    def _parse_with_pymupdf(self, file_path: str) -> List[Dict]:
+        """Parse PDF using PyMuPDF (fastest backend)."""
+        doc = pymupdf.open(file_path)
+        try:
+            page_count = doc.page_count
+            if page_count > _PARALLEL_PAGE_THRESHOLD:
+                doc.close()
+                # Each worker opens its own document handle and runs both
+                # extraction and the regex scan for its page; matches from
+                # headers repeated across pages are collapsed by the final
+                # dedup pass since workers cannot share seen-line state
+                per_page = _page_pool.map(
+                    _parse_page_transactions,
+                    [file_path] * page_count,
+                    range(page_count),
+                )
+                merged: List[Dict] = []
+                for page_transactions in per_page:
+                    merged.extend(page_transactions)
+                return self._deduplicate_transactions(merged)
+
+            # Plain "text" flavor skips building layout object graphs
+            page_texts = [page.get_text("text") for page in doc]
+        finally:
+            if not doc.is_closed:
+                doc.close()
+
+        transactions = []
+        seen_lines: set = set()
+        for text in page_texts:
+            if text:
+                text = self._drop_repeated_lines(text, seen_lines)
+                transactions.extend(self._extract_transactions_from_text(text))
+
+        return transactions
+
+    @staticmethod
+    def _drop_repeated_lines(text: str, seen_lines: set) -> str:
+        """
+        Filter out lines already seen on earlier pages.
+
+        Statements repeat the same header/footer block on every page; the
+        regex scan would otherwise re-process it once per page and rely on
+        dedup to discard the duplicate matches.
+        """
+        fresh = []
+        for line in text.splitlines():
+            h = hash(line)
+            if h not in seen_lines:
+                seen_lines.add(h)
+                fresh.append(line)
+        return '\n'.join(fresh)
+    
+    def _parse_with_pdfplumber(self, file_path: str) -> List[Dict]:
+        """Parse PDF using pdfplumber (better for structured tables)."""
+        return list(self._iter_pdfplumber_transactions(file_path))
+
+    def _iter_pdfplumber_transactions(self, file_path: str):
+        """Yield transactions page by page, releasing page caches eagerly."""
+        import pdfplumber
+
+        seen_lines: set = set()
+        with pdfplumber.open(file_path) as pdf:
+            for page in pdf.pages:
+                try:
+                    # Skips word clustering and layout analysis; the regex
+                    # scan only needs raw line text
+                    text = page.extract_text_simple()
+                except Exception:
+                    text = page.extract_text()
+                # pdfplumber keeps every parsed page's char/line/rect tables
+                # cached; dropping them right after text extraction keeps
+                # peak memory flat on multi-hundred-page statements
+                page.flush_cache()
+                page.close()
+                if text:
+                    text = self._drop_repeated_lines(text, seen_lines)
+                    yield from self._extract_transactions_from_text(text)
+    
+    def _parse_with_pypdf2(self, file_path: str) -> List[Dict]:
+        """Parse PDF using PyPDF2 (fallback method)."""
+        import PyPDF2
+
+        transactions = []
+
+        with open(file_path, 'rb') as file:
+            pdf_reader = PyPDF2.PdfReader(file)
+            
+            for page in pdf_reader.pages:
+                text = page.extract_text()
+                if text:
+                    page_transactions = self._extract_transactions_from_text(text)
+                    transactions.extend(page_transactions)
+        
+        return transactions
+    
+    def _extract_transactions_from_text(self, text: str) -> List[Dict]:
+        """
+        Extract transaction data from text using pattern matching.
+
+        Args:
+            text: Extracted text from PDF
+
+        Returns:
+            List of transaction dictionaries
+        """
+        # Fast reject: drop lines with fewer than four digits (minimum for
+        # any date) before the regex engine ever sees them; prose and
+        # header blocks go away in one C-level translate per line
+        text = '\n'.join(
+            line for line in text.split('\n')
+            if len(line) - len(line.translate(_DIGIT_TT)) >= 4
+        )
+        if not text:
+            return []
+
+        return self._scan_text(text)
+
+    def _scan_text(self, text: str) -> List[Dict]:
+        """
+        Scan text with all transaction patterns and collect parsed rows.
+
+        Every pattern runs over the full text: rows matched identically by
+        several patterns collapse in the insertion-time dedup, while lines
+        where a looser pattern mis-splits the amount still get their
+        correct row from a stricter one.
+
+        Args:
+            text: Extracted text from PDF
+
+        Returns:
+            List of transaction dictionaries
+        """
+        # Struct-of-arrays accumulation: four parallel lists instead of a
+        # dict per row keeps the hot loop to list appends and defers dict
+        # construction to the API boundary below
+        dates: List[str] = []
+        amounts: List[float] = []
+        descriptions: List[str] = []
+        types: List[str] = []
+        seen = set()
+
+        # Duplicates are dropped at insertion time, keyed on date, amount
+        # in cents, and the description prefix, instead of a second full
+        # pass afterwards
+        for rx in self._COMPILED_PATTERNS:
+            for match in rx.finditer(text):
+                try:
+                    fields = self._parse_transaction_fields(match.groups())
+                except Exception as e:
+                    logger.debug("Error parsing transaction: %s", e)
+                    continue
+
+                if fields:
+                    parsed_date, amount, description, transaction_type = fields
+                    key = (parsed_date, int(round(amount * 100)), description[:50])
+                    if key not in seen:
+                        seen.add(key)
+                        dates.append(parsed_date)
+                        amounts.append(amount)
+                        descriptions.append(description)
+                        types.append(transaction_type)
+
+        # Materialize the public list-of-dicts shape in one pass
+        return [
+            {"date": d, "amount": a, "description": desc, "type": t}
+            for d, a, desc, t in zip(dates, amounts, descriptions, types)
+        ]
+    
+    def _parse_transaction_match(self, match: re.Match) -> Optional[Dict]:
+        """
+        Parse a regex match into a transaction dictionary.
+        
+        Args:
+            match: Regex match object
+            
+        Returns:
+            Transaction dictionary or None
+        """
+        return self._parse_transaction_groups(match.groups())
+
+    def _parse_transaction_groups(self, groups) -> Optional[Dict]:
+        """
+        Parse a (date, amount, description) capture tuple into a transaction.
+
+        Args:
+            groups: The three capture groups of a transaction pattern
+
+        Returns:
+            Transaction dictionary or None
+        """
+        fields = self._parse_transaction_fields(groups)
+        if not fields:
+            return None
+
+        parsed_date, amount, description, transaction_type = fields
+        return {
+            "date": parsed_date,
+            "amount": amount,
+            "description": description,
+            "type": transaction_type
+        }
+
+    def _parse_transaction_fields(self, groups) -> Optional[tuple]:
+        """
+        Parse a capture tuple into (date, amount, description, type) fields.
+
+        The tuple form feeds the struct-of-arrays accumulation in
+        _extract_transactions_from_text without building a dict per row.
+
+        Args:
+            groups: The three capture groups of a transaction pattern
+
+        Returns:
+            (date, amount, description, type) tuple or None
+        """
+        if len(groups) < 3:
+            return None
+
+        # Determine which group is date, amount, description
+        date_str = groups[0]
+
+        # Check if second group is amount or description
+        if self._is_amount(groups[1]):
+            amount_str = groups[1]
+            description = groups[2].strip()
+        else:
+            description = groups[1].strip()
+            amount_str = groups[2]
+
+        # Parse date
+        parsed_date = self._parse_date(date_str)
+        if not parsed_date:
+            return None
+
+        # Parse amount
+        amount = self._parse_amount(amount_str)
+        if amount is None:
+            return None
+
+        # Determine transaction type by indexing on the sign test instead
+        # of branching; the outcome alternates per row, so the branch
+        # predictor gets nothing to work with
+        transaction_type = ("income", "expense")[amount < 0]
+        amount = abs(amount)
+
+        # Clean description
+        description = self._clean_description(description)
+
+        return (parsed_date, amount, description, transaction_type)
+    
+    def _is_amount(self, text: str) -> bool:
+        """Check if text looks like an amount."""
+        # Single fullmatch instead of a float() round-trip that raises
+        # on every description it is probed with
+        return bool(_AMOUNT_RX.fullmatch(text.strip()))
+    
+    def _parse_date(self, date_str: str) -> Optional[str]:
+        """
+        Parse date string into YYYY-MM-DD format.
+        Supports both English and Polish date formats.
+        
+        Args:
+            date_str: Date string in various formats
+            
+        Returns:
+            Date in YYYY-MM-DD format or None
+        """
+        return _parse_date_impl(date_str)
+    
+    def _parse_amount(self, amount_str: str) -> Optional[float]:
+        """
+        Parse amount string into float.
+        Supports both English (period) and Polish (comma) decimal separators.
+        
+        Args:
+            amount_str: Amount string with possible currency symbols
+            
+        Returns:
+            Float amount or None
+        """
+        return _parse_amount_impl(amount_str)
+    
+    def _clean_description(self, description: str) -> str:
+        """
+        Clean and normalize transaction description.
+        
+        Args:
+            description: Raw description text
+            
+        Returns:
+            Cleaned description
+        """
+        # Collapse whitespace with C-level tokenize/join, then strip
+        # leading/trailing number noise and cap the length
+        description = ' '.join(description.split())
+        return _CLEAN_RX.sub('', description)[:200].strip()
+    
+    def _deduplicate_transactions(self, transactions: List[Dict]) -> List[Dict]:
+        """
+        Remove duplicate transactions.
+        
+        Args:
+            transactions: List of transaction dictionaries
+            
+        Returns:
+            Deduplicated list
+        """
+        seen = set()
+        unique_transactions = []
+        
+        for trans in transactions:
+            # Create a key from date, amount, and first 50 chars of description
+            key = (
+                trans.get('date'),
+                trans.get('amount'),
+                trans.get('description', '')[:50]
+            )
+            
+            if key not in seen:
+                seen.add(key)
+                unique_transactions.append(trans)
+        
+        return unique_transactions
@@ -4,6 +4,7 @@ Router for transaction categorization endpoints.
 from fastapi import APIRouter, HTTPException
 
 from schemas import CategorizeRequest, CategorizeResponse, CategorySuggestion
+from schemas import CategorizeBatchRequest, CategorizeBatchResponse
 from schemas import TrainRequest, TrainResponse
 from models.categorizer import get_categorizer
 
@@ -42,6 +43,35 @@ async def categorize_transaction(request: CategorizeRequest):
         )
 
 
+@router.post("/categorize-batch", response_model=CategorizeBatchResponse)
+async def categorize_batch(request: CategorizeBatchRequest):
+    """
+    Suggest categories for a batch of transactions in a single pass.
+
+    Args:
+        request: CategorizeBatchRequest with transaction descriptions
+
+    Returns:
+        CategorizeBatchResponse with one suggestion per description
+    """
+    try:
+        categorizer = get_categorizer()
+        results = categorizer.categorize_batch(request.descriptions)
+
+        return CategorizeBatchResponse(
+            success=True,
+            suggestions=[
+                CategorySuggestion(category=category, confidence=confidence)
+                for category, confidence in results
+            ]
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=500,
+            detail=f"Categorization failed: {str(e)}"
+        )
+
+
 @router.post("/train", response_model=TrainResponse)
 async def train_categorization(request: TrainRequest):
     """
@@ -2,22 +2,22 @@
 Router for PDF parsing endpoints.
 """
 import os
-import tempfile
+import logging
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
+import aiofiles.tempfile
 from fastapi import APIRouter, UploadFile, File, HTTPException, Form
 from typing import List
 
+from executors import CPU_EXECUTOR
 from schemas import ParsePDFResponse, TransactionData
 from parsers.gemini_pdf_parser import create_pdf_parser
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 # Use Gemini parser if API key is available, otherwise fallback to regex parser
 pdf_parser = create_pdf_parser(use_gemini=True)
 
-# Thread pool for running blocking operations
-executor = ThreadPoolExecutor(max_workers=4)
-
 
 @router.post("/pdf", response_model=ParsePDFResponse)
 async def parse_pdf(
@@ -44,44 +44,69 @@ async def parse_pdf(
     
     # Save uploaded file temporarily
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix='.pdf') as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
+        header = b''
+        async with aiofiles.tempfile.NamedTemporaryFile('wb', suffix='.pdf', delete=False) as tmp_file:
+            # Stream in 1 MB chunks instead of slurping the whole upload
+            # into memory first; async writes keep the event loop free
+            # during multi-MB disk I/O
+            while chunk := await file.read(1 << 20):
+                if not header:
+                    header = chunk[:8]
+                await tmp_file.write(chunk)
             tmp_file_path = tmp_file.name
+
+        # Reject non-PDF payloads before spending parser (or Gemini API)
+        # time on them; the extension check above only covers the name
+        if not header.startswith(b'%PDF'):
+            raise HTTPException(status_code=400, detail="File is not a valid PDF")
         
-        print(f"📤 Starting PDF parsing for: {file.filename}")
-        
+        logger.debug("Starting PDF parsing for: %s", file.filename)
+
         # Parse categories and accounts
         category_list = [c.strip() for c in categories.split(',') if c.strip()] if categories else None
         account_list = [a.strip() for a in accounts.split(',') if a.strip()] if accounts else None
-        
+
         if category_list:
-            print(f"📋 Using {len(category_list)} existing categories")
+            logger.debug("Using %d existing categories", len(category_list))
         if account_list:
-            print(f"🏦 Using {len(account_list)} existing accounts")
-        
-        # Parse PDF in a thread pool to avoid blocking the event loop
-        loop = asyncio.get_event_loop()
-        transactions_data = await loop.run_in_executor(
-            executor,
-            pdf_parser.parse_pdf,
-            tmp_file_path,
-            category_list,
-            account_list
-        )
+            logger.debug("Using %d existing accounts", len(account_list))
         
-        print(f"📥 Received {len(transactions_data)} transactions from parser")
+        if hasattr(pdf_parser, 'parse_pdf_async'):
+            # Gemini parser: await the API call directly so the event loop
+            # stays free during generation
+            transactions_data = await pdf_parser.parse_pdf_async(
+                tmp_file_path,
+                category_list,
+                account_list
+            )
+        else:
+            # Regex parser is CPU-bound - run it in a thread pool to avoid
+            # blocking the event loop. It takes only the file path; category
+            # and account hints are a Gemini-parser feature.
+            loop = asyncio.get_event_loop()
+            transactions_data = await loop.run_in_executor(
+                CPU_EXECUTOR,
+                pdf_parser.parse_pdf,
+                tmp_file_path
+            )
         
+        logger.debug("Received %d transactions from parser", len(transactions_data))
+
         # Debug: Check first transaction data
-        if transactions_data and len(transactions_data) > 0:
+        if transactions_data and logger.isEnabledFor(logging.DEBUG):
             first = transactions_data[0]
-            print(f"🔍 First transaction raw: category={first.get('category')}, account={first.get('account')}")
+            logger.debug(
+                "First transaction raw: category=%s, account=%s",
+                first.get('category'), first.get('account')
+            )
         
         # Convert to TransactionData objects
         transactions = []
         for trans in transactions_data:
             try:
-                transaction = TransactionData(
+                # model_construct skips Pydantic validation; the parsers
+                # have already normalized and validated these fields
+                transaction = TransactionData.model_construct(
                     date=trans['date'],
                     amount=trans['amount'],
                     description=trans['description'],
@@ -91,17 +116,18 @@ async def parse_pdf(
                 )
                 transactions.append(transaction)
             except Exception as e:
-                print(f"❌ Error creating transaction object: {e}")
-                print(f"   Transaction data: {trans}")
+                logger.warning("Error creating transaction object: %s (data: %s)", e, trans)
                 continue
-        
-        print(f"✅ Returning {len(transactions)} valid transactions to backend")
-        
+
+        logger.debug("Returning %d valid transactions to backend", len(transactions))
+
         # Debug: Log first transaction being returned
-        if transactions and len(transactions) > 0:
+        if transactions and logger.isEnabledFor(logging.DEBUG):
             first_tx = transactions[0]
-            print(f"🚀 Sending to backend - First transaction:")
-            print(f"   category={first_tx.category}, account={first_tx.account}")
+            logger.debug(
+                "Sending to backend - first transaction: category=%s, account=%s",
+                first_tx.category, first_tx.account
+            )
         
         response = ParsePDFResponse(
             success=True,
@@ -111,12 +137,15 @@ async def parse_pdf(
         
         return response
     
+    except HTTPException:
+        raise
+
     except Exception as e:
-        print(f"❌ PDF parsing error: {e}")
+        logger.error("PDF parsing error: %s", e)
         raise HTTPException(status_code=500, detail=f"Error parsing PDF: {str(e)}")
-    
+
     finally:
         # Clean up temporary file
         if tmp_file_path and os.path.exists(tmp_file_path):
             os.unlink(tmp_file_path)
-            print(f"🗑️  Cleaned up temp file")
+            logger.debug("Cleaned up temp file")
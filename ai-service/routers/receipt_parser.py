@@ -2,20 +2,24 @@
 Router for receipt OCR parsing endpoints.
 """
 import os
-import tempfile
+
+# Tesseract's OpenMP threading is slower than running single-threaded
+# instances in parallel processes; must be set before pytesseract is
+# imported (via parsers.receipt_parser below).
+os.environ.setdefault('OMP_THREAD_LIMIT', '1')
+
+import io
 import asyncio
-from concurrent.futures import ThreadPoolExecutor
 from fastapi import APIRouter, UploadFile, File, HTTPException
+from PIL import Image
 
+from executors import OCR_EXECUTOR
 from schemas import ParseReceiptResponse, TransactionData
 from parsers.receipt_parser import ReceiptParser
 
 router = APIRouter()
 receipt_parser = ReceiptParser()
 
-# Thread pool for running blocking operations
-executor = ThreadPoolExecutor(max_workers=4)
-
 
 @router.post("/receipt", response_model=ParseReceiptResponse)
 async def parse_receipt(file: UploadFile = File(...)):
@@ -38,20 +42,29 @@ async def parse_receipt(file: UploadFile = File(...)):
             detail="File must be a JPEG or PNG image"
         )
     
-    # Save uploaded file temporarily
-    tmp_file_path = None
     try:
-        with tempfile.NamedTemporaryFile(delete=False, suffix=file_ext) as tmp_file:
-            content = await file.read()
-            tmp_file.write(content)
-            tmp_file_path = tmp_file.name
-        
-        # Parse receipt in a thread pool to avoid blocking the event loop
+        # Keep the upload in memory — receipts are small, and skipping
+        # the temp file avoids two disk round-trips before OCR
+        content = await file.read()
+
+        # Reject non-image payloads before spending OCR time on them;
+        # the extension check above only covers the name
+        if not (content.startswith(b'\xff\xd8') or content.startswith(b'\x89PNG')):
+            raise HTTPException(
+                status_code=400,
+                detail="File is not a valid JPEG or PNG image"
+            )
+
+        image = Image.open(io.BytesIO(content))
+
+        # Parse receipt in the shared OCR process pool: one
+        # single-threaded Tesseract per core overlaps concurrent uploads
+        # without blocking the event loop
         loop = asyncio.get_event_loop()
         result = await loop.run_in_executor(
-            executor,
+            OCR_EXECUTOR,
             receipt_parser.parse_receipt,
-            tmp_file_path
+            image
         )
         
         # Convert transaction data
@@ -75,13 +88,11 @@ async def parse_receipt(file: UploadFile = File(...)):
             message=f"Successfully parsed receipt with {len(items)} items"
         )
     
+    except HTTPException:
+        raise
+
     except Exception as e:
         raise HTTPException(
             status_code=500,
             detail=f"Error parsing receipt: {str(e)}"
         )
-    
-    finally:
-        # Clean up temporary file
-        if tmp_file_path and os.path.exists(tmp_file_path):
-            os.unlink(tmp_file_path)
@@ -51,6 +51,18 @@ class CategorizeResponse(BaseModel):
     message: Optional[str] = None
 
 
+class CategorizeBatchRequest(BaseModel):
+    """Request to categorize a batch of transactions."""
+    descriptions: List[str]
+
+
+class CategorizeBatchResponse(BaseModel):
+    """Response from batch categorization."""
+    success: bool
+    suggestions: List[CategorySuggestion] = []
+    message: Optional[str] = None
+
+
 class TrainRequest(BaseModel):
     """Request to train categorization model."""
     description: str
@@ -1,21 +1,77 @@
-"""Test script to list available Gemini models."""
-import os
-from dotenv import load_dotenv
-import google.generativeai as genai
-
-load_dotenv()
-
-api_key = os.getenv('GEMINI_API_KEY')
-if not api_key:
-    print("No API key found!")
-    exit(1)
-
-genai.configure(api_key=api_key)
-
-print("Available Gemini models:\n")
-for model in genai.list_models():
-    if 'generateContent' in model.supported_generation_methods:
-        print(f"✓ {model.name}")
-        print(f"  Display name: {model.display_name}")
-        print(f"  Description: {model.description[:100]}...")
-        print()
+"""Test script to list available Gemini models."""
+import asyncio
+import json
+import os
+import time
+from dotenv import load_dotenv
+import google.generativeai as genai
+
+load_dotenv()
+
+# Model listings change rarely; cache them so re-runs (and CI) skip the
+# paginated network calls entirely while the cache is fresh
+CACHE_FILE = '.gemini_models_cache.json'
+CACHE_TTL_SECONDS = 24 * 60 * 60
+
+
+def _load_cached_models():
+    """Return cached model entries if the cache file is fresh, else None."""
+    try:
+        if time.time() - os.path.getmtime(CACHE_FILE) > CACHE_TTL_SECONDS:
+            return None
+        with open(CACHE_FILE, 'r') as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def _save_cached_models(models):
+    """Write model entries to the cache file."""
+    try:
+        with open(CACHE_FILE, 'w') as f:
+            json.dump(models, f, indent=2)
+    except OSError as e:
+        print(f"Could not write cache: {e}")
+
+
+async def list_generation_models():
+    """Fetch models supporting generateContent, via cache when possible."""
+    cached = _load_cached_models()
+    if cached is not None:
+        print("(from cache)\n")
+        return cached
+
+    # The SDK paginates synchronously; run it off the event loop so the
+    # listing does not block other async work
+    models = await asyncio.to_thread(lambda: list(genai.list_models()))
+    entries = [
+        {
+            "name": model.name,
+            "display_name": model.display_name,
+            "description": model.description,
+        }
+        for model in models
+        if 'generateContent' in model.supported_generation_methods
+    ]
+    _save_cached_models(entries)
+    return entries
+
+
+async def main():
+    api_key = os.getenv('GEMINI_API_KEY')
+    if not api_key:
+        print("No API key found!")
+        return
+
+    genai.configure(api_key=api_key)
+
+    print("Available Gemini models:\n")
+    for entry in await list_generation_models():
+        print(f"✓ {entry['name']}")
+        print(f"  Display name: {entry['display_name']}")
+        print(f"  Description: {entry['description'][:100]}...")
+        print()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -6,19 +6,37 @@ import os
 from models.categorizer import TransactionCategorizer
 
 
+@pytest.fixture(scope="module")
+def _base_categorizer():
+    """
+    One in-memory categorizer shared by the module.
+
+    Default-pattern loading and automaton construction only need to happen
+    once; individual tests get a cleared view via the categorizer fixture.
+    """
+    return TransactionCategorizer(rules_file=None)
+
+
+@pytest.fixture
+def categorizer(_base_categorizer):
+    """Reset learned state so each test starts from the defaults."""
+    _base_categorizer.clear_learned_rules()
+    return _base_categorizer
+
+
 @pytest.fixture
-def categorizer():
-    """Create a fresh categorizer instance for testing."""
+def file_categorizer():
+    """Create a file-backed categorizer for persistence tests."""
     test_rules_file = "test_categorization_rules.json"
-    
+
     # Clean up any existing test file
     if os.path.exists(test_rules_file):
         os.remove(test_rules_file)
-    
+
     cat = TransactionCategorizer(rules_file=test_rules_file)
-    
+
     yield cat
-    
+
     # Clean up after test
     if os.path.exists(test_rules_file):
         os.remove(test_rules_file)
@@ -99,13 +117,14 @@ def test_learn_overwrites_incorrect_category(categorizer):
     assert category2 == "Entertainment"
 
 
-def test_learned_rules_persist(categorizer):
+def test_learned_rules_persist(file_categorizer):
     """Test that learned rules are saved and can be loaded."""
-    # Learn a pattern
-    categorizer.learn("Custom Merchant ABC", "Healthcare")
-    
+    # Learn a pattern and force the debounced save to disk
+    file_categorizer.learn("Custom Merchant ABC", "Healthcare")
+    file_categorizer.flush()
+
     # Create a new categorizer with the same rules file
-    new_categorizer = TransactionCategorizer(rules_file=categorizer.rules_file)
+    new_categorizer = TransactionCategorizer(rules_file=file_categorizer.rules_file)
     
     # Should still know the pattern
     category, confidence = new_categorizer.categorize("Custom Merchant ABC")
@@ -276,6 +295,31 @@ def test_pattern_extraction_removes_common_words(categorizer):
     assert confidence > 0.7
 
 
+def test_categorize_batch_matches_single_calls(categorizer):
+    """Test that batch categorization agrees with individual categorize calls."""
+    categorizer.learn("ACME Corp XYZ123", "Bills & Fees")
+    categorizer.learn("PAYPAL 123", "Bills & Fees")
+
+    descriptions = [
+        "Starbucks Coffee",
+        "ACME Corp XYZ123",
+        "ZZZZ Unknown Merchant 12345",
+        "Uber ride to airport",
+        # Trailing reference number: both paths must strip it the same way
+        "PAYPAL 456",
+    ]
+
+    batch_results = categorizer.categorize_batch(descriptions)
+    single_results = [categorizer.categorize(d) for d in descriptions]
+
+    assert batch_results == single_results
+
+
+def test_categorize_batch_empty(categorizer):
+    """Test batch categorization with no descriptions."""
+    assert categorizer.categorize_batch([]) == []
+
+
 def test_pattern_matching_learned_rules_priority(categorizer):
     """Test that learned rules take priority over default patterns."""
     # "gym" is in default patterns for Personal Care